@@ -95,76 +95,98 @@ class AlibiClue(Clue):
     clue_type = Alibi
 
 
-clues = [
-    # witness saw gender
-    GenderClue(location.WITNESS),
-    # neighbors heard screams (gender)
-    GenderClue(location.NEIGHBOR),
-    # gender caught on CCTV
-    GenderClue(location.CCTV),
-    # gender caught on phone
-    GenderClue(location.VICTIM_PHONE),
-
-    # link to victim revealed in a death-threat letter
-    LinkClue(location.VICTIM_HOUSE, [
-        LinkToVictim.SIBLING, LinkToVictim.COLLEAGUE, LinkToVictim.NEIGHBORHOOD, LinkToVictim.EX]),
-    # link to victim revealed during a lie
-    LinkClue(location.MURDERER_HOUSE, [
-        LinkToVictim.SIBLING, LinkToVictim.COLLEAGUE, LinkToVictim.NEIGHBORHOOD]),
-    # shows a troubled mind that kills strangers
-    LinkClue(location.MURDERER_HOUSE, [
-        LinkToVictim.UNKNOWN]),
-    # amount of violence suggests passion
-    LinkClue(location.CRIME_SCENE, [
-        LinkToVictim.SIBLING]),
-    # victim writing on the wall : victim knows the killer
-    LinkClue(location.CRIME_SCENE, [
-        LinkToVictim.SIBLING, LinkToVictim.EX]),
-    # cold blooded and robbed suggest unknown relation
-    LinkClue(location.CRIME_SCENE, [
-        LinkToVictim.NEIGHBORHOOD]),
-    # victim was threaten by a sibling
-    LinkClue(location.VICTIM_PHONE, [
-        LinkToVictim.SIBLING]),
-    # victim was harcelated and threaten by a coworker
-    LinkClue(location.VICTIM_PHONE, [
-        LinkToVictim.COLLEAGUE]),
-
-    # hand revealed in a death-threat letter
-    HandClue(location.VICTIM_HOUSE, [
-        LinkToVictim.SIBLING, LinkToVictim.COLLEAGUE, LinkToVictim.NEIGHBORHOOD]),
-    # hand revealed in a death-threat letter
-    HandClue(location.MURDER_WEAPON),
-    # witness saw hand
-    HandClue(location.WITNESS),
-
-    # witness saw hair color
-    HairClue(location.WITNESS),
-    # hair found at the crime scene
-    HairClue(location.CRIME_SCENE),
-    # hair color caught on CCTV
-    HairClue(location.CCTV),
-    # hair found under the victim's fingernails
-    HairClue(location.VICTIM),
-    # hair found on the murder weapon
-    HairClue(location.MURDER_WEAPON),
-    # hair color caught on phone
-    HairClue(location.VICTIM_PHONE),
-
-    # witness saw eye color
-    EyeColorClue(location.WITNESS),
-    # eye color caught on phone
-    EyeColorClue(location.VICTIM_PHONE),
-
-    # murderer blood found at the crime scene (UV light, fences)
-    BloodTypeClue(location.CRIME_SCENE),
-    # murderer blood found under the victim's fingernails
-    BloodTypeClue(location.VICTIM),
-    # murderer blood found on the murder weapon
-    BloodTypeClue(location.MURDER_WEAPON),
-
-    # witness saw height
-    HeightClue(location.WITNESS),
-    # large footstep found in grass
-    HeightClue(location.CRIME_SCENE),
-]
+def _build_clues():
+    """Return the full catalog of clues that can be generated for a case."""
+
+    return [
+        # witness saw gender
+        GenderClue(location.WITNESS),
+        # neighbors heard screams (gender)
+        GenderClue(location.NEIGHBOR),
+        # gender caught on CCTV
+        GenderClue(location.CCTV),
+        # gender caught on phone
+        GenderClue(location.VICTIM_PHONE),
+
+        # link to victim revealed in a death-threat letter
+        LinkClue(location.VICTIM_HOUSE, [
+            LinkToVictim.SIBLING, LinkToVictim.COLLEAGUE, LinkToVictim.NEIGHBORHOOD, LinkToVictim.EX]),
+        # link to victim revealed during a lie
+        LinkClue(location.MURDERER_HOUSE, [
+            LinkToVictim.SIBLING, LinkToVictim.COLLEAGUE, LinkToVictim.NEIGHBORHOOD]),
+        # shows a troubled mind that kills strangers
+        LinkClue(location.MURDERER_HOUSE, [
+            LinkToVictim.UNKNOWN]),
+        # amount of violence suggests passion
+        LinkClue(location.CRIME_SCENE, [
+            LinkToVictim.SIBLING]),
+        # victim writing on the wall : victim knows the killer
+        LinkClue(location.CRIME_SCENE, [
+            LinkToVictim.SIBLING, LinkToVictim.EX]),
+        # cold blooded and robbed suggest unknown relation
+        LinkClue(location.CRIME_SCENE, [
+            LinkToVictim.NEIGHBORHOOD]),
+        # victim was threaten by a sibling
+        LinkClue(location.VICTIM_PHONE, [
+            LinkToVictim.SIBLING]),
+        # victim was harcelated and threaten by a coworker
+        LinkClue(location.VICTIM_PHONE, [
+            LinkToVictim.COLLEAGUE]),
+
+        # hand revealed in a death-threat letter
+        HandClue(location.VICTIM_HOUSE, [
+            LinkToVictim.SIBLING, LinkToVictim.COLLEAGUE, LinkToVictim.NEIGHBORHOOD]),
+        # hand revealed in a death-threat letter
+        HandClue(location.MURDER_WEAPON),
+        # witness saw hand
+        HandClue(location.WITNESS),
+
+        # witness saw hair color
+        HairClue(location.WITNESS),
+        # hair found at the crime scene
+        HairClue(location.CRIME_SCENE),
+        # hair color caught on CCTV
+        HairClue(location.CCTV),
+        # hair found under the victim's fingernails
+        HairClue(location.VICTIM),
+        # hair found on the murder weapon
+        HairClue(location.MURDER_WEAPON),
+        # hair color caught on phone
+        HairClue(location.VICTIM_PHONE),
+
+        # witness saw eye color
+        EyeColorClue(location.WITNESS),
+        # eye color caught on phone
+        EyeColorClue(location.VICTIM_PHONE),
+
+        # murderer blood found at the crime scene (UV light, fences)
+        BloodTypeClue(location.CRIME_SCENE),
+        # murderer blood found under the victim's fingernails
+        BloodTypeClue(location.VICTIM),
+        # murderer blood found on the murder weapon
+        BloodTypeClue(location.MURDER_WEAPON),
+
+        # witness saw height
+        HeightClue(location.WITNESS),
+        # large footstep found in grass
+        HeightClue(location.CRIME_SCENE),
+    ]
+
+
+_clues = None
+
+
+def load_clues():
+    """Return the clue catalog, building it on first use."""
+
+    global _clues
+    if _clues is None:
+        _clues = _build_clues()
+    return _clues
+
+
+def __getattr__(name):
+    # ``clues`` used to be a module-level list; keep it reachable lazily.
+    if name == "clues":
+        return load_clues()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
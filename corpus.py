@@ -0,0 +1,88 @@
+"""Helpers for generating large collections of distinct cases."""
+
+import sqlite3
+
+from suspect import Case
+
+# Number of insertions between two commits of the index.
+COMMIT_EVERY = 1000
+
+
+class CaseIndex:
+    """On-disk set of canonical case hashes used to reject duplicates.
+
+    The index is an SQLite table keyed on the hash, so membership tests are
+    single B-tree lookups that do not load the index in memory, and the
+    index survives across corpus generation runs.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS cases "
+            "(hash BLOB PRIMARY KEY, value BLOB) WITHOUT ROWID"
+        )
+        self.pending = 0
+
+    def __contains__(self, case):
+        row = self.db.execute(
+            "SELECT 1 FROM cases WHERE hash = ?", (self._key(case),)
+        ).fetchone()
+        return row is not None
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM cases").fetchone()[0]
+
+    def add(self, case, value=b""):
+        """Record ``case`` and return ``True`` if it was not already indexed."""
+
+        cursor = self.db.execute(
+            "INSERT OR IGNORE INTO cases VALUES (?, ?)", (self._key(case), value)
+        )
+        if cursor.rowcount == 0:
+            return False
+        self.pending += 1
+        if self.pending >= COMMIT_EVERY:
+            self.commit()
+        return True
+
+    def commit(self):
+        self.db.commit()
+        self.pending = 0
+
+    def close(self):
+        self.commit()
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def _key(case):
+        if isinstance(case, Case):
+            case = case.canonical_hash()
+        return bytes.fromhex(case) if isinstance(case, str) else case
+
+
+def generate_corpus(seeds, index, failures=None):
+    """Yield ``(seed, case)`` for every seed producing a case new to ``index``.
+
+    Seeds whose case cannot be built are skipped; when ``failures`` is a
+    list, ``(seed, exception)`` pairs are appended to it.
+    """
+
+    for seed in seeds:
+        try:
+            case = Case(seed=seed, verbose=False)
+        except Exception as e:
+            if failures is not None:
+                failures.append((seed, e))
+            continue
+        if index.add(case, str(seed).encode()):
+            yield seed, case
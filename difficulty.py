@@ -0,0 +1,67 @@
+"""Cheap difficulty scores computed from case records.
+
+Scores only use fields of :meth:`suspect.Case.to_record`, so a serialized
+corpus can be ranked or bucketed without rebuilding any case.
+"""
+
+from bisect import bisect_right
+
+# Contribution of each record feature to the difficulty score.
+WEIGHTS = {
+    # facts the player must combine to single out the murderer
+    "facts": 1.0,
+    # innocents sharing every trait of the murderer
+    "dopplegangers": 0.5,
+    # whether alibis must be checked to clear the dopplegangers
+    "alibi": 1.0,
+    # places the player may waste visits on
+    "inspectable": 0.25,
+    # visits an optimal player needs
+    "reveals": 1.0,
+}
+
+
+def expected_reveals(record):
+    """Return the number of visits an optimal player needs to solve the case.
+
+    This is the ``reveals`` count of the investigation plan.  Records
+    without it, or whose plan cannot reach the murderer, fall back to
+    counting the clue locations, plus one visit when alibis must be checked.
+    """
+
+    if record.get("reveals") is not None:
+        return record["reveals"]
+    return len(record["clue_locations"]) + int(record["alibi"])
+
+
+def difficulty(record):
+    """Return the difficulty score of a case or of its record."""
+
+    if not isinstance(record, dict):
+        record = record.to_record()
+    return (
+        WEIGHTS["facts"] * len(record["facts"])
+        + WEIGHTS["dopplegangers"] * record["n_dopplegangers"]
+        + WEIGHTS["alibi"] * record["alibi"]
+        + WEIGHTS["inspectable"] * record["n_inspectable"]
+        + WEIGHTS["reveals"] * expected_reveals(record)
+    )
+
+
+def rank(records):
+    """Return ``records`` sorted from easiest to hardest."""
+
+    return sorted(records, key=difficulty)
+
+
+def bucket(records, edges):
+    """Group records by difficulty using the sorted bucket ``edges``.
+
+    Bucket ``i`` holds records scoring in ``[edges[i - 1], edges[i])``, so
+    there are ``len(edges) + 1`` buckets.
+    """
+
+    buckets = [[] for _ in range(len(edges) + 1)]
+    for record in records:
+        buckets[bisect_right(edges, difficulty(record))].append(record)
+    return buckets
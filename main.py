@@ -1,9 +1,5 @@
 """Simple entry point that constructs a case for manual experimentation."""
 
-import matplotlib.pyplot as plt
-import networkx as nx
-import pandas as pd
-
 from suspect import Case
 
 case = Case()
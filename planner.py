@@ -0,0 +1,157 @@
+"""Optimal order in which to visit the locations of a case.
+
+Visiting a location reveals every murderer trait whose clue was found there,
+and checking alibis clears the innocents sharing all those traits.  The
+planner searches, for every set of already visited locations, the next visit
+leading to the murderer with the fewest visits.  Results are kept in two
+byte strings indexed by the visited set, so hints and bots only do lookups.
+"""
+
+from clue import AlibiClue
+from modality import location
+from query import Population
+
+# Pseudo-location standing for checking the alibis of the suspects.
+ALIBI = "ALIBI"
+NONE = 255
+
+
+class InvestigationPlan:
+    """Decision table over the locations ``actions`` of a case.
+
+    For the set of visited actions encoded as bitmask ``visited``,
+    ``moves[visited]`` is the index of the best next action, or ``NONE``
+    when the murderer is already found or cannot be found, and
+    ``costs[visited]`` is the number of visits still needed (``NONE`` if
+    the murderer cannot be found).
+    """
+
+    def __init__(self, actions, moves, costs):
+        self.actions = list(actions)
+        self.moves = bytes(moves)
+        self.costs = bytes(costs)
+
+    def _mask(self, visited):
+        mask = 0
+        for action in visited:
+            if action in self.actions:
+                mask |= 1 << self.actions.index(action)
+        return mask
+
+    def next_action(self, visited=()):
+        """Return the best location to visit next, or ``None`` if done."""
+
+        move = self.moves[self._mask(visited)]
+        return None if move == NONE else self.actions[move]
+
+    def remaining_visits(self, visited=()):
+        """Return the number of visits still needed, or ``None``."""
+
+        cost = self.costs[self._mask(visited)]
+        return None if cost == NONE else cost
+
+    def route(self, visited=()):
+        """Return the optimal sequence of visits from ``visited``."""
+
+        mask = self._mask(visited)
+        route = []
+        while self.moves[mask] != NONE:
+            route.append(self.actions[self.moves[mask]])
+            mask |= 1 << self.moves[mask]
+        return route
+
+    def to_dict(self):
+        """Return a JSON-serializable form of the plan.
+
+        Costs are left out; :meth:`from_dict` rebuilds them from the moves.
+        """
+
+        return {
+            "actions": [getattr(a, "name", a) for a in self.actions],
+            "moves": self.moves.hex(),
+            "solvable": self.solvable,
+        }
+
+    @property
+    def solvable(self):
+        """Whether visiting every action isolates the murderer."""
+
+        return self.costs[-1] == 0
+
+    @classmethod
+    def from_moves(cls, actions, moves, solvable):
+        """Rebuild a plan from its moves alone.
+
+        Remaining suspects only shrink with each visit, so either every
+        state can reach the murderer or none can; the costs are then the
+        lengths of the routes given by ``moves``.
+        """
+
+        costs = bytearray(len(moves))
+        for visited in range(len(moves)):
+            if not solvable:
+                costs[visited] = NONE
+                continue
+            mask = visited
+            while moves[mask] != NONE:
+                costs[visited] += 1
+                mask |= 1 << moves[mask]
+        return cls(actions, moves, costs)
+
+    @classmethod
+    def from_dict(cls, data):
+        actions = [a if a == ALIBI else location[a] for a in data["actions"]]
+        return cls.from_moves(actions, bytes.fromhex(data["moves"]), data["solvable"])
+
+
+def plan_case(case):
+    """Compute the :class:`InvestigationPlan` of ``case``."""
+
+    population = Population(case.suspects)
+    facts = [fact for fact, clue in case.clues.items() if clue is not AlibiClue]
+    actions = sorted(
+        {case.clues[fact].location for fact in facts}, key=lambda loc: loc.value
+    )
+    # Suspects compatible with the facts revealed by each action.
+    reveals = [
+        _intersect(population, [f for f in facts if case.clues[f].location == a])
+        for a in actions
+    ]
+    if len(facts) < len(case.clues):
+        # Innocents sharing every fact with the murderer have an alibi.
+        actions.append(ALIBI)
+        reveals.append(population.full & ~(_intersect(population, facts) & ~1))
+
+    n_states = 1 << len(actions)
+    memo = {}
+
+    def search(visited, remaining):
+        if remaining == 1:
+            return 0, NONE
+        if visited not in memo:
+            best = (NONE, NONE)
+            for i, suspects in enumerate(reveals):
+                if visited >> i & 1:
+                    continue
+                cost, _ = search(visited | 1 << i, remaining & suspects)
+                if cost != NONE and cost + 1 < best[0]:
+                    best = (cost + 1, i)
+            memo[visited] = best
+        return memo[visited]
+
+    moves = bytearray(n_states)
+    costs = bytearray(n_states)
+    for visited in range(n_states):
+        remaining = population.full
+        for i, suspects in enumerate(reveals):
+            if visited >> i & 1:
+                remaining &= suspects
+        costs[visited], moves[visited] = search(visited, remaining)
+    return InvestigationPlan(actions, moves, costs)
+
+
+def _intersect(population, facts):
+    mask = population.full
+    for fact in facts:
+        mask &= population.index[fact]
+    return mask
@@ -0,0 +1,199 @@
+"""Boolean trait queries over large suspect populations.
+
+Queries combine ``genotype`` criteria with ``&``, ``|`` and ``~``; a bare
+criterion may be used wherever one side of an operator is a query::
+
+    query = (
+        Q(Gender.MALE) & Q(Height.TALL)
+        & (Q(BloodType.A) | Q(BloodType.AB)) & ~Q(LinkToVictim.SIBLING)
+    )
+    population = Population(suspects)
+    population.select(query)
+
+A :class:`Population` indexes every criterion as a bitset of suspects.
+Conjunctions are evaluated from the most to the least selective operand and
+stop as soon as no suspect is left, and results of subqueries are kept in
+an LRU cache.
+"""
+
+from collections import OrderedDict
+
+from genotype import criterions
+
+# Number of subquery results kept by a population, least recently used first
+# evicted.
+CACHE_SIZE = 1024
+
+
+class Query:
+    """Base class of query nodes, providing the boolean operators."""
+
+    def __and__(self, other):
+        return And(self, other)
+
+    def __or__(self, other):
+        return Or(self, other)
+
+    # Reflected operators let a bare criterion stand on the left.
+    def __rand__(self, other):
+        return And(other, self)
+
+    def __ror__(self, other):
+        return Or(other, self)
+
+    def __invert__(self):
+        return Not(self)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.key == other.key
+
+    def __hash__(self):
+        return hash((type(self), self.key))
+
+
+class Q(Query):
+    """Suspects having the trait ``criterion``."""
+
+    def __init__(self, criterion):
+        self.criterion = criterion
+        self.key = criterion
+
+    def estimate(self, population):
+        return population.counts[self.criterion]
+
+    def evaluate(self, population):
+        return population.index[self.criterion]
+
+    def __repr__(self):
+        return f"Q({self.criterion})"
+
+
+class And(Query):
+    """Suspects matching every operand."""
+
+    def __init__(self, *operands):
+        # Flatten nested conjunctions so they can be ordered together.
+        self.operands = tuple(_flatten(And, operands))
+        self.key = frozenset(self.operands)
+
+    def estimate(self, population):
+        return min(population.estimate(q) for q in self.operands)
+
+    def evaluate(self, population):
+        mask = population.full
+        for operand in sorted(self.operands, key=population.estimate):
+            mask &= population.evaluate(operand)
+            if not mask:
+                break
+        return mask
+
+    def __repr__(self):
+        return "(" + " & ".join(map(repr, self.operands)) + ")"
+
+
+class Or(Query):
+    """Suspects matching at least one operand."""
+
+    def __init__(self, *operands):
+        self.operands = tuple(_flatten(Or, operands))
+        self.key = frozenset(self.operands)
+
+    def estimate(self, population):
+        return min(sum(population.estimate(q) for q in self.operands), population.size)
+
+    def evaluate(self, population):
+        mask = 0
+        for operand in sorted(self.operands, key=population.estimate, reverse=True):
+            mask |= population.evaluate(operand)
+            if mask == population.full:
+                break
+        return mask
+
+    def __repr__(self):
+        return "(" + " | ".join(map(repr, self.operands)) + ")"
+
+
+class Not(Query):
+    """Suspects not matching the operand."""
+
+    def __init__(self, operand):
+        if not isinstance(operand, Query):
+            operand = Q(operand)
+        self.operand = operand
+        self.key = operand
+
+    def estimate(self, population):
+        return population.size - population.estimate(self.operand)
+
+    def evaluate(self, population):
+        return population.full & ~population.evaluate(self.operand)
+
+    def __repr__(self):
+        return f"~{self.operand!r}"
+
+
+def _flatten(cls, operands):
+    for operand in operands:
+        if not isinstance(operand, Query):
+            operand = Q(operand)
+        if type(operand) is cls:
+            yield from operand.operands
+        else:
+            yield operand
+
+
+class Population:
+    """Trait index over ``suspects`` answering :class:`Query` objects."""
+
+    def __init__(self, suspects):
+        self.suspects = list(suspects)
+        self.size = len(self.suspects)
+        self.full = (1 << self.size) - 1
+        self.index = {criterion: 0 for criterion in criterions}
+        for i, suspect in enumerate(self.suspects):
+            for trait in suspect.traits:
+                self.index[trait] |= 1 << i
+        # Per-criterion selectivity used to order conjunctions.
+        self.counts = {c: mask.bit_count() for c, mask in self.index.items()}
+        self.cache = OrderedDict()
+
+    def estimate(self, query):
+        return query.estimate(self)
+
+    def evaluate(self, query):
+        """Return the bitset of suspects matching ``query``."""
+
+        if isinstance(query, Q):
+            return query.evaluate(self)
+        mask = self.cache.get(query)
+        if mask is None:
+            mask = query.evaluate(self)
+            self.cache[query] = mask
+            if len(self.cache) > CACHE_SIZE:
+                self.cache.popitem(last=False)
+        else:
+            self.cache.move_to_end(query)
+        return mask
+
+    def ids(self, query):
+        """Return the indices of suspects matching ``query``."""
+
+        if not isinstance(query, Query):
+            query = Q(query)
+        mask = self.evaluate(query)
+        ids = []
+        while mask:
+            low = mask & -mask
+            ids.append(low.bit_length() - 1)
+            mask ^= low
+        return ids
+
+    def select(self, query):
+        """Return the suspects matching ``query``."""
+
+        return [self.suspects[i] for i in self.ids(query)]
+
+    def count(self, query):
+        if not isinstance(query, Query):
+            query = Q(query)
+        return self.evaluate(query).bit_count()
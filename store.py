@@ -0,0 +1,371 @@
+"""Case store kept in shared memory for multi-process game servers.
+
+A loader process packs cases into fixed-size byte records inside a
+:class:`multiprocessing.shared_memory.SharedMemory` block.  Workers attach to
+the block by name and read cases through views that decode fields on access,
+so no worker holds its own copy of the corpus.
+
+Record layout (one byte per field unless noted)::
+
+    n_suspects
+    traits          MAX_SUSPECTS x len(TRAIT_ENUMS) Enum values
+    n_clues
+    clues           MAX_CLUES x (fact enum, fact value, catalog index)
+    flags           2 bytes, bit i set if ENVIRONMENT_FLAGS[i] is true
+    houses          2 bytes, bit i set if house i can be inspected
+    routines        len(ROUTINES) Enum values, NONE if absent
+    n_facts
+    facts           MAX_FACTS x (fact enum, fact value) of possibilities[0]
+    dopplegangers   2 bytes, bit i set if suspect i is a doppleganger
+    n_actions
+    solvable        1 if the investigation plan reaches the murderer
+    actions         MAX_ACTIONS location values, ALIBI_CODE for alibis
+    moves           2 ** MAX_ACTIONS best next actions of the plan
+
+Facts and dopplegangers let views be scored with ``difficulty``, and the
+plan lets workers answer hints without running the planner.
+"""
+
+from functools import cached_property
+from multiprocessing import resource_tracker, shared_memory
+
+from clue import AlibiClue, load_clues
+from genotype import (
+    Alibi,
+    BloodType,
+    EyeColor,
+    Gender,
+    HairColor,
+    Hand,
+    Height,
+    LinkToVictim,
+    genotypes,
+)
+from modality import location
+from planner import ALIBI, NONE, InvestigationPlan
+from routine import MurderWeaponRoutine, VictimPhoneLockRoutine, VictimPhoneRoutine
+from suspect import Case, Suspect
+
+MAX_SUSPECTS = 10
+# possibilities hold at most 7 facts, plus the alibi.
+MAX_CLUES = 8
+# get_maximum_features combines at most 7 facts.
+MAX_FACTS = 7
+# One action per fact location, plus the alibi check.
+MAX_ACTIONS = MAX_FACTS + 1
+ALIBI_CODE = 254
+
+# Attribute name and Enum of each trait, in ``Suspect.traits`` order.
+TRAIT_ENUMS = [
+    ("gender", Gender),
+    ("eye_color", EyeColor),
+    ("hair_color", HairColor),
+    ("height", Height),
+    ("blood_type", BloodType),
+    ("hand", Hand),
+    ("link", LinkToVictim),
+]
+FACT_ENUMS = genotypes + [Alibi]
+ENVIRONMENT_FLAGS = [
+    "murder_weapon",
+    "can_inspect_murder_weapon",
+    "victim_phone",
+    "can_inspect_victim_phone",
+    "can_inspect_victim_house",
+    "cctv",
+    "can_inspect_cctv",
+    "neighbor",
+    "can_inspect_neighbor",
+]
+ROUTINES = [
+    ("victim_phone_routine", VictimPhoneRoutine),
+    ("victim_phone_lock_routine", VictimPhoneLockRoutine),
+    ("murder_weapon_routine", MurderWeaponRoutine),
+]
+
+TRAITS_OFFSET = 1
+CLUES_OFFSET = TRAITS_OFFSET + MAX_SUSPECTS * len(TRAIT_ENUMS)
+FLAGS_OFFSET = CLUES_OFFSET + 1 + 3 * MAX_CLUES
+HOUSES_OFFSET = FLAGS_OFFSET + 2
+ROUTINES_OFFSET = HOUSES_OFFSET + 2
+FACTS_OFFSET = ROUTINES_OFFSET + len(ROUTINES)
+DOPPLEGANGERS_OFFSET = FACTS_OFFSET + 1 + 2 * MAX_FACTS
+PLAN_OFFSET = DOPPLEGANGERS_OFFSET + 2
+MOVES_OFFSET = PLAN_OFFSET + 2 + MAX_ACTIONS
+RECORD_SIZE = MOVES_OFFSET + 2 ** MAX_ACTIONS
+# The header holds the number of cases.
+HEADER_SIZE = 8
+
+
+def encode_case(case):
+    """Pack ``case`` into a ``bytearray`` of ``RECORD_SIZE`` bytes.
+
+    Raises ``ValueError`` if the case has more suspects or clues than a
+    record can hold.
+    """
+
+    if case.n_suspects > MAX_SUSPECTS:
+        raise ValueError(
+            f"case has {case.n_suspects} suspects, a record holds {MAX_SUSPECTS}"
+        )
+    if len(case.possibilities[0]) > MAX_FACTS:
+        raise ValueError(
+            f"case has {len(case.possibilities[0])} facts, a record holds {MAX_FACTS}"
+        )
+    if len(case.clues) > MAX_CLUES:
+        raise ValueError(
+            f"case has {len(case.clues)} clues, a record holds {MAX_CLUES}"
+        )
+
+    record = bytearray(RECORD_SIZE)
+    record[0] = case.n_suspects
+    for i, suspect in enumerate(case.suspects):
+        start = TRAITS_OFFSET + i * len(TRAIT_ENUMS)
+        record[start:start + len(TRAIT_ENUMS)] = bytes(
+            trait.value for trait in suspect.traits
+        )
+
+    catalog = load_clues()
+    record[CLUES_OFFSET] = len(case.clues)
+    for i, (fact, clue) in enumerate(case.clues.items()):
+        start = CLUES_OFFSET + 1 + 3 * i
+        index = NONE if clue is AlibiClue else catalog.index(clue)
+        record[start:start + 3] = bytes(
+            (FACT_ENUMS.index(type(fact)), fact.value, index)
+        )
+
+    env = case.environment
+    flags = sum(1 << i for i, name in enumerate(ENVIRONMENT_FLAGS) if env[name])
+    houses = sum(1 << i for i, house in enumerate(env["can_inspect_houses"]) if house)
+    record[FLAGS_OFFSET:FLAGS_OFFSET + 2] = flags.to_bytes(2, "little")
+    record[HOUSES_OFFSET:HOUSES_OFFSET + 2] = houses.to_bytes(2, "little")
+    for i, (name, _) in enumerate(ROUTINES):
+        record[ROUTINES_OFFSET + i] = env[name].value if name in env else NONE
+
+    facts = [fact for fact, _ in case.possibilities[0]]
+    record[FACTS_OFFSET] = len(facts)
+    for i, fact in enumerate(facts):
+        start = FACTS_OFFSET + 1 + 2 * i
+        record[start:start + 2] = bytes((FACT_ENUMS.index(type(fact)), fact.value))
+    dopplegangers = sum(1 << i for i in case.dopplegangers)
+    record[DOPPLEGANGERS_OFFSET:DOPPLEGANGERS_OFFSET + 2] = dopplegangers.to_bytes(
+        2, "little"
+    )
+
+    plan = case.get_plan()
+    record[PLAN_OFFSET] = len(plan.actions)
+    record[PLAN_OFFSET + 1] = plan.solvable
+    record[PLAN_OFFSET + 2:PLAN_OFFSET + 2 + len(plan.actions)] = bytes(
+        ALIBI_CODE if action == ALIBI else action.value for action in plan.actions
+    )
+    record[MOVES_OFFSET:MOVES_OFFSET + len(plan.moves)] = plan.moves
+    return record
+
+
+class SuspectView(Suspect):
+    """Read-only suspect whose traits are decoded from a store record."""
+
+    def __init__(self, case, index):
+        self.case = case
+        self.index = index
+
+    @property
+    def guilty(self):
+        return self.index == 0
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, SuspectView)
+            and (self.case, self.index) == (other.case, other.index)
+        )
+
+    def __hash__(self):
+        return hash((self.case, self.index))
+
+
+def _trait_property(position, enum):
+    def getter(self):
+        offset = TRAITS_OFFSET + self.index * len(TRAIT_ENUMS) + position
+        return enum(self.case.read(offset))
+
+    return property(getter)
+
+
+for _position, (_name, _enum) in enumerate(TRAIT_ENUMS):
+    setattr(SuspectView, _name, _trait_property(_position, _enum))
+
+
+class CaseView(Case):
+    """Read-only case backed by a record of a :class:`CaseStore`.
+
+    Suspects, clues, environment, the chosen facts, the dopplegangers and
+    the investigation plan are stored, so ``filter``, ``get_graph``,
+    ``canonical_hash``, ``to_record`` or ``get_plan`` work on a view.
+
+    Views read the store on each access instead of holding a memoryview of
+    their own, so they never keep the block from closing; reading a view
+    after its store is closed raises ``ValueError``.
+    """
+
+    def __init__(self, store, key):
+        self.store = store
+        self.key = key
+        self.offset = key * RECORD_SIZE
+        self.verbose = False
+
+    def read(self, start, stop=None):
+        """Return the record byte at ``start``, or bytes up to ``stop``."""
+
+        records = self.store.records
+        if stop is None:
+            return records[self.offset + start]
+        return bytes(records[self.offset + start:self.offset + stop])
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, CaseView)
+            and (self.store, self.key) == (other.store, other.key)
+        )
+
+    def __hash__(self):
+        return hash((id(self.store), self.key))
+
+    @property
+    def n_suspects(self):
+        return self.read(0)
+
+    @cached_property
+    def suspects(self):
+        return [SuspectView(self, i) for i in range(self.n_suspects)]
+
+    @cached_property
+    def suspect2id(self):
+        return {s: i for i, s in enumerate(self.suspects)}
+
+    @cached_property
+    def clues(self):
+        catalog = load_clues()
+        clues = {}
+        for i in range(self.read(CLUES_OFFSET)):
+            start = CLUES_OFFSET + 1 + 3 * i
+            enum_index, value, index = self.read(start, start + 3)
+            fact = FACT_ENUMS[enum_index](value)
+            clues[fact] = AlibiClue if index == NONE else catalog[index]
+        return clues
+
+    @cached_property
+    def possibilities(self):
+        # Only the first, chosen combination of facts is stored.
+        facts = []
+        for i in range(self.read(FACTS_OFFSET)):
+            start = FACTS_OFFSET + 1 + 2 * i
+            enum_index, value = self.read(start, start + 2)
+            fact = FACT_ENUMS[enum_index](value)
+            suspects = {
+                j for j, suspect in enumerate(self.suspects) if fact in suspect.traits
+            }
+            facts.append((fact, suspects))
+        return [tuple(facts)]
+
+    @cached_property
+    def dopplegangers(self):
+        start = DOPPLEGANGERS_OFFSET
+        mask = int.from_bytes(self.read(start, start + 2), "little")
+        return {i for i in range(self.n_suspects) if mask >> i & 1}
+
+    def get_plan(self):
+        """Return the investigation plan decoded from the record."""
+
+        if getattr(self, "plan", None) is None:
+            n_actions = self.read(PLAN_OFFSET)
+            actions = [
+                ALIBI if code == ALIBI_CODE else location(code)
+                for code in self.read(PLAN_OFFSET + 2, PLAN_OFFSET + 2 + n_actions)
+            ]
+            moves = self.read(MOVES_OFFSET, MOVES_OFFSET + 2 ** n_actions)
+            self.plan = InvestigationPlan.from_moves(
+                actions, moves, self.read(PLAN_OFFSET + 1)
+            )
+        return self.plan
+
+    @cached_property
+    def environment(self):
+        flags = int.from_bytes(self.read(FLAGS_OFFSET, FLAGS_OFFSET + 2), "little")
+        houses = int.from_bytes(self.read(HOUSES_OFFSET, HOUSES_OFFSET + 2), "little")
+        environment = {}
+        for i, (name, enum) in enumerate(ROUTINES):
+            if self.read(ROUTINES_OFFSET + i) != NONE:
+                environment[name] = enum(self.read(ROUTINES_OFFSET + i))
+        for i, name in enumerate(ENVIRONMENT_FLAGS):
+            environment[name] = bool(flags >> i & 1)
+        environment["can_inspect_houses"] = [
+            bool(houses >> i & 1) for i in range(self.n_suspects)
+        ]
+        return environment
+
+
+class CaseStore:
+    """Sequence of :class:`CaseView` over a shared memory block."""
+
+    def __init__(self, shm, owner=False):
+        self.shm = shm
+        self.owner = owner
+        self.buf = shm.buf if owner else shm.buf.toreadonly()
+        self.n_cases = int.from_bytes(self.buf[:HEADER_SIZE], "little")
+        self.records = self.buf[HEADER_SIZE:HEADER_SIZE + self.n_cases * RECORD_SIZE]
+
+    @classmethod
+    def create(cls, cases, name=None):
+        """Pack ``cases`` into a new shared memory block (loader side)."""
+
+        records = [encode_case(case) for case in cases]
+        size = HEADER_SIZE + max(len(records), 1) * RECORD_SIZE
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        shm.buf[:HEADER_SIZE] = len(records).to_bytes(HEADER_SIZE, "little")
+        for i, record in enumerate(records):
+            start = HEADER_SIZE + i * RECORD_SIZE
+            shm.buf[start:start + RECORD_SIZE] = record
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        """Attach read-only to the block created by a loader (worker side)."""
+
+        shm = shared_memory.SharedMemory(name=name)
+        # Workers must not unlink the block when they exit; only the loader
+        # owns it.
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return cls(shm)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def __len__(self):
+        return self.n_cases
+
+    def __getitem__(self, key):
+        if not 0 <= key < self.n_cases:
+            raise IndexError(key)
+        return CaseView(self, key)
+
+    def close(self):
+        """Unmap the block; the loader also unlinks it.
+
+        ``BufferError`` is raised if memoryviews of the block are still
+        exported, but the loader unlinks the block in any case.
+        """
+
+        try:
+            self.records.release()
+            self.buf.release()
+            self.shm.close()
+        finally:
+            if self.owner:
+                self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
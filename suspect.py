@@ -1,12 +1,10 @@
 """Manage suspects and deduction logic for the murder mystery game."""
 
+import hashlib
 import itertools
 import random
-from pprint import pprint
 
-import networkx as nx
-
-from clue import AlibiClue, clues, location
+from clue import AlibiClue, load_clues, location
 from genotype import (
     Alibi,
     BloodType,
@@ -25,6 +23,8 @@ from genotype import (
     get_random_height,
     get_random_link,
 )
+from planner import plan_case
+from query import Population
 from routine import (
     VictimPhoneLockRoutine,
     get_random_murder_weapon_routine,
@@ -63,6 +63,20 @@ class Suspect:
             "link_to_victim": self.link,
         }
 
+    @property
+    def traits(self):
+        """Return the suspect's traits as a hashable tuple of Enum members."""
+
+        return (
+            self.gender,
+            self.eye_color,
+            self.hair_color,
+            self.height,
+            self.blood_type,
+            self.hand,
+            self.link,
+        )
+
     def __repr__(self):
         return str(self.identity)
 
@@ -70,9 +84,29 @@ class Suspect:
 class Case:
     """Encapsulates a murder case with multiple suspects and clues."""
 
-    def __init__(self, seed=None):
+    # Deduction structures, computed in order once the suspects exist.
+    stages = (
+        "get_graph",
+        "get_commonalities",
+        "get_dopplegangers",
+        "get_maximum_features",
+        "get_clues",
+        "get_environment",
+    )
+
+    def __init__(self, seed=None, verbose=True):
+        self.generate_suspects(seed, verbose)
+
+        # Precompute structures used in deduction.
+        for stage in self.stages:
+            getattr(self, stage)()
+
+    def generate_suspects(self, seed=None, verbose=True):
+        """Draw the suspects, marking the first one as guilty."""
+
         if seed is not None:
             random.seed(seed)
+        self.verbose = verbose
 
         # Create a random number of suspects and mark the first as guilty.
         self.n_suspects = random.randint(5, 10)
@@ -80,14 +114,6 @@ class Case:
         self.suspects[0].guilty = True
         self.suspect2id = {s: i for i, s in enumerate(self.suspects)}
 
-        # Precompute structures used in deduction.
-        self.get_graph()
-        self.get_commonalities()
-        self.get_dopplegangers()
-        self.get_maximum_features()
-        self.get_clues()
-        self.get_environment()
-
     def __getitem__(self, key):
         return self.suspects[key]
 
@@ -112,12 +138,95 @@ class Case:
         elif isinstance(criteria, LinkToVictim):
             return [suspect for suspect in self.suspects if suspect.link == criteria]
 
+    def query(self, query):
+        """Return suspects matching a boolean combination of criteria.
+
+        See :mod:`query`; plain criteria are accepted as well.
+        """
+
+        # Rebuild the index whenever the suspects were changed.
+        population = getattr(self, "population", None)
+        if population is None or population.suspects != self.suspects:
+            self.population = Population(self.suspects)
+        return self.population.select(query)
+
     def data(self):
         return [s.identity for s in self.suspects]
 
+    def canonical_form(self):
+        """Return a representation of the case independent of innocent order.
+
+        The murderer (index 0) keeps its place; innocents are sorted together
+        with whether their house can be inspected, so two cases that only
+        differ by a permutation of innocents share the same canonical form.
+        """
+
+        houses = self.environment["can_inspect_houses"]
+        murderer = (tuple(enum_key(t) for t in self.suspects[0].traits), houses[0])
+        innocents = sorted(
+            (tuple(enum_key(t) for t in suspect.traits), houses[i])
+            for i, suspect in enumerate(self.suspects[1:], start=1)
+        )
+        # Several catalog clues share a repr, so key them by catalog index.
+        # AlibiClue is stored as a class rather than an instance.
+        catalog = load_clues()
+        clues = sorted(
+            (enum_key(fact), -1 if clue is AlibiClue else catalog.index(clue))
+            for fact, clue in self.clues.items()
+        )
+        environment = sorted(
+            (name, enum_key(value) if hasattr(value, "name") else value)
+            for name, value in self.environment.items()
+            if name != "can_inspect_houses"
+        )
+        return (murderer, tuple(innocents), tuple(clues), tuple(environment))
+
+    def canonical_hash(self):
+        """Return a hex digest of :meth:`canonical_form`."""
+
+        form = repr(self.canonical_form()).encode()
+        return hashlib.blake2b(form, digest_size=16).hexdigest()
+
+    def to_record(self):
+        """Return a JSON-serializable summary of the case.
+
+        The record carries what is needed to rank cases (see ``difficulty``)
+        without rebuilding them.
+        """
+
+        env = self.environment
+        inspectable = [
+            env[name] for name in env if name.startswith("can_inspect_")
+            and name != "can_inspect_houses"
+        ]
+        return {
+            "hash": self.canonical_hash(),
+            "n_suspects": self.n_suspects,
+            "facts": [enum_key(fact) for fact, _ in self.possibilities[0]],
+            "n_dopplegangers": len(self.dopplegangers),
+            "alibi": Alibi.BAR in self.clues,
+            "clue_locations": sorted({
+                clue.location.name
+                for clue in self.clues.values() if clue is not AlibiClue
+            }),
+            "n_inspectable": sum(inspectable) + sum(env["can_inspect_houses"]),
+            "reveals": self.get_plan().remaining_visits(),
+            "plan": self.get_plan().to_dict(),
+        }
+
+    def get_plan(self):
+        """Return the optimal investigation plan, computing it on first use."""
+
+        if getattr(self, "plan", None) is None:
+            self.plan = plan_case(self)
+        return self.plan
+
     def get_graph(self):
         """Build a bipartite graph linking features to suspects."""
 
+        # networkx is imported lazily to keep ``import suspect`` cheap.
+        import networkx as nx
+
         G = nx.DiGraph()
         G.add_nodes_from(criterions + list(range(self.n_suspects)))
         for criteria in criterions:
@@ -130,6 +239,8 @@ class Case:
 
     def draw(self):
         import matplotlib.pyplot as plt
+        import networkx as nx
+
         nx.draw_networkx(self.G, pos=nx.bipartite_layout(self.G, criterions))
         plt.show()
 
@@ -189,12 +300,15 @@ class Case:
             r -= 1
 
         possibilities = sorted(possibilities, key=lambda x: len(x), reverse=True)
-        print(self.n_suspects, "suspects")
         if len(possibilities) == 0:
             self.possibilities = [min_possibilities]
         else:
             self.possibilities = possibilities
-        pprint(self.possibilities[0])
+        if self.verbose:
+            from pprint import pprint
+
+            print(self.n_suspects, "suspects")
+            pprint(self.possibilities[0])
 
     def get_clues(self):
         """Generate a set of clues based on distinguishing features."""
@@ -204,7 +318,7 @@ class Case:
         facts_and_suspects = self.possibilities[0]
         facts = [it for it, _ in facts_and_suspects]
         fact2clues = defaultdict(list)
-        for clue in clues:
+        for clue in load_clues():
             for fact in facts:
                 if not isinstance(fact, clue.clue_type):
                     continue
@@ -224,7 +338,8 @@ class Case:
         if len(alibis) > 0:
             generated_clues[Alibi.BAR] = AlibiClue
         self.clues = generated_clues
-        print(self.clues)
+        if self.verbose:
+            print(self.clues)
 
     def get_environment(self):
         """Create an environment dict describing available investigative actions."""
@@ -301,11 +416,20 @@ class Case:
         environment["neighbor"] = neighbor
         environment["can_inspect_neighbor"] = can_inspect_neighbor
 
-        pprint(environment)
+        if self.verbose:
+            from pprint import pprint
+
+            pprint(environment)
         # Expose the generated environment for external use and return it.
         self.environment = environment
         return environment
 
 
+def enum_key(member):
+    """Return a stable ``"EnumName.MEMBER"`` string for an Enum member."""
+
+    return f"{type(member).__name__}.{member.name}"
+
+
 def p(threshold):
     return random.random() < threshold
@@ -0,0 +1,161 @@
+"""Sweep ranges of seeds across all cores and record the ones that crash.
+
+Usage::
+
+    python sweep.py 0 1000000 --failures failures.json --log failures.jsonl
+
+Every failing seed is appended to the ``--log`` JSON-lines file, and the
+``--failures`` corpus keeps the smallest seed of each distinct failure.
+"""
+
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import time
+
+from suspect import Case
+
+
+def run_seed(seed):
+    """Build the case for ``seed`` and return ``None`` or a failure record."""
+
+    case = Case.__new__(Case)
+    stage = "generate_suspects"
+    try:
+        case.generate_suspects(seed, verbose=False)
+        for stage in Case.stages:
+            getattr(case, stage)()
+    except Exception as e:
+        return {
+            "seed": seed,
+            "stage": stage,
+            "exception": type(e).__name__,
+            "message": str(e),
+        }
+    return None
+
+
+def run_chunk(bounds):
+    """Run every seed in ``range(*bounds)`` and return the failures."""
+
+    failures = []
+    for seed in range(*bounds):
+        failure = run_seed(seed)
+        if failure is not None:
+            failures.append(failure)
+    return bounds, failures
+
+
+def signature(failure):
+    return failure["stage"], failure["exception"], failure["message"]
+
+
+def minimize(failures):
+    """Keep the smallest seed for each distinct (stage, exception, message)."""
+
+    corpus = {}
+    for failure in failures:
+        key = signature(failure)
+        if key not in corpus or failure["seed"] < corpus[key]["seed"]:
+            corpus[key] = failure
+    return sorted(corpus.values(), key=lambda f: f["seed"])
+
+
+def sweep(
+    start, stop, processes=None, chunk_size=10000, report=None,
+    log=None, corpus=None,
+):
+    """Run seeds ``start`` to ``stop`` in parallel and return all failures.
+
+    Failures are written as chunks complete, so an interrupted sweep keeps
+    what it found: each record is appended to the JSON-lines file ``log``
+    and merged into the minimized corpus stored at ``corpus``.  ``report``
+    is called after each chunk with the number of seeds done and the
+    elapsed time, which is enough to derive throughput.
+    """
+
+    chunks = (
+        (lo, min(lo + chunk_size, stop)) for lo in range(start, stop, chunk_size)
+    )
+    failures = []
+    minimized = load_corpus(corpus) if corpus is not None else []
+    done = 0
+    started = time.perf_counter()
+    log_file = open(log, "a") if log is not None else contextlib.nullcontext()
+    with log_file, multiprocessing.Pool(processes) as pool:
+        for (lo, hi), chunk_failures in pool.imap_unordered(run_chunk, chunks):
+            failures.extend(chunk_failures)
+            if chunk_failures and log is not None:
+                for failure in chunk_failures:
+                    log_file.write(json.dumps(failure) + "\n")
+                log_file.flush()
+            if chunk_failures and corpus is not None:
+                merged = minimize(minimized + chunk_failures)
+                if merged != minimized:
+                    minimized = merged
+                    write_corpus(corpus, minimized)
+            done += hi - lo
+            if report is not None:
+                report(done, time.perf_counter() - started)
+    return sorted(failures, key=lambda f: f["seed"])
+
+
+def load_corpus(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_corpus(path, corpus):
+    """Write ``corpus`` to ``path`` atomically."""
+
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(corpus, f, indent=2)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def save_corpus(path, failures):
+    """Merge ``failures`` into the minimized corpus stored at ``path``."""
+
+    corpus = minimize(load_corpus(path) + failures)
+    write_corpus(path, corpus)
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("start", type=int)
+    parser.add_argument("stop", type=int)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    parser.add_argument("--failures", default="failures.json")
+    parser.add_argument("--log", default="failures.jsonl")
+    args = parser.parse_args()
+
+    total = args.stop - args.start
+
+    def report(done, elapsed):
+        rate = done / elapsed
+        print(
+            f"{done}/{total} seeds, {rate:.0f} seeds/s, "
+            f"eta {(total - done) / rate:.0f}s, "
+            f"1e8 seeds in {1e8 / rate / 3600:.1f}h"
+        )
+
+    failures = sweep(
+        args.start, args.stop, args.processes, args.chunk_size, report,
+        log=args.log, corpus=args.failures,
+    )
+    corpus = load_corpus(args.failures)
+    print(f"{len(failures)} failing seeds, {len(corpus)} in minimized corpus")
+    for failure in corpus:
+        print(failure)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@ import io
 import os
 import sys
 
+import pytest
+
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from suspect import Case
@@ -67,3 +69,294 @@ def test_seed_yields_deterministic_suspects():
     profiles1 = [s.identity for s in case1.suspects]
     profiles2 = [s.identity for s in case2.suspects]
     assert profiles1 == profiles2
+
+
+def test_cold_import_stays_within_budget():
+    import subprocess
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        "from suspect import Case\n"
+        "print(time.perf_counter() - start)\n"
+        "print(','.join(m for m in ('networkx', 'matplotlib', 'pandas', 'pprint')"
+        " if m in sys.modules))\n"
+    )
+    best = float("inf")
+    for _ in range(3):
+        out = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=root, capture_output=True, text=True, check=True,
+        ).stdout.split("\n")
+        best = min(best, float(out[0]))
+        # Heavy dependencies must only be loaded on first use.
+        assert out[1] == ""
+    assert best < 0.2
+
+
+def test_canonical_hash_ignores_innocent_order():
+    case = Case(seed=7)
+    digest = case.canonical_hash()
+    innocents = case.suspects[1:]
+    houses = case.environment["can_inspect_houses"]
+    case.suspects[1:] = innocents[::-1]
+    case.environment["can_inspect_houses"] = houses[:1] + houses[1:][::-1]
+    assert case.canonical_hash() == digest
+    assert Case(seed=8).canonical_hash() != digest
+
+
+def test_case_index_rejects_duplicates(tmp_path):
+    from corpus import CaseIndex, generate_corpus
+
+    with CaseIndex(str(tmp_path / "index")) as index:
+        first = [seed for seed, _ in generate_corpus([1, 2, 1], index)]
+        assert first == [1, 2]
+        assert Case(seed=2) in index
+    with CaseIndex(str(tmp_path / "index")) as index:
+        assert list(generate_corpus([2, 3], index))[0][0] == 3
+        assert len(index) == 3
+
+
+def test_generate_corpus_skips_crashing_seeds(tmp_path):
+    from corpus import CaseIndex, generate_corpus
+
+    failures = []
+    with CaseIndex(str(tmp_path / "index")) as index:
+        seeds = [seed for seed, _ in generate_corpus(range(12, 17), index, failures)]
+    assert seeds == [12, 13, 15, 16]
+    assert [seed for seed, _ in failures] == [14]
+    assert isinstance(failures[0][1], TypeError)
+
+
+def test_canonical_hash_tells_apart_clues_sharing_a_repr():
+    from clue import load_clues
+
+    # "amount of violence" and "writing on the wall" are both link clues
+    # found at the crime scene.
+    violence, writing = [
+        c for c in load_clues()
+        if repr(c) == "link_CRIME_SCENE" and LinkToVictim.SIBLING in c.conditions
+    ]
+    case = Case(seed=0, verbose=False)
+    case.clues = {LinkToVictim.SIBLING: violence}
+    digest = case.canonical_hash()
+    case.clues = {LinkToVictim.SIBLING: writing}
+    assert case.canonical_hash() != digest
+
+
+def _known_failures():
+    import json
+
+    path = os.path.join(os.path.dirname(__file__), "failures.json")
+    with open(path) as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize("failure", _known_failures(), ids=lambda f: str(f["seed"]))
+def test_known_failing_seeds(failure):
+    from sweep import run_seed
+
+    # Once the crash is fixed, remove the seed from tests/failures.json.
+    assert run_seed(failure["seed"]) == failure
+
+
+def test_sweep_records_failing_stage():
+    from sweep import minimize, run_chunk
+
+    _, failures = run_chunk((0, 20))
+    assert [f["seed"] for f in failures] == [14]
+    assert failures[0]["stage"] == "get_clues"
+    assert minimize(failures + failures) == failures
+
+
+def test_sweep_writes_failures_as_it_goes(tmp_path):
+    import json
+
+    from sweep import load_corpus, sweep
+
+    log = str(tmp_path / "failures.jsonl")
+    corpus = str(tmp_path / "failures.json")
+    failures = sweep(0, 30, processes=1, chunk_size=10, log=log, corpus=corpus)
+    with open(log) as f:
+        logged = [json.loads(line) for line in f]
+    assert logged == failures
+    assert [f["seed"] for f in failures] == [14]
+    assert load_corpus(corpus) == failures
+
+
+def test_difficulty_from_record_matches_case():
+    import json
+
+    from difficulty import bucket, difficulty, expected_reveals, rank
+
+    cases = [Case(seed=seed, verbose=False) for seed in range(5)]
+    records = [json.loads(json.dumps(case.to_record())) for case in cases]
+    for case, record in zip(cases, records):
+        assert difficulty(case) == difficulty(record)
+        assert expected_reveals(record) >= 1
+    ranked = rank(records)
+    assert [difficulty(r) for r in ranked] == sorted(map(difficulty, records))
+    buckets = bucket(records, [difficulty(ranked[2])])
+    assert sum(map(len, buckets)) == len(records)
+    assert ranked[0] in buckets[0] and ranked[-1] in buckets[1]
+
+
+def _hash_stored_case(name, index, queue):
+    from store import CaseStore
+
+    store = CaseStore.attach(name)
+    queue.put(store[index].canonical_hash())
+    store.close()
+
+
+def test_shared_case_store_round_trip():
+    import multiprocessing
+
+    from store import CaseStore
+
+    cases = [Case(seed=seed, verbose=False) for seed in range(4)]
+    with CaseStore.create(cases) as store:
+        assert len(store) == 4
+        view = store[2]
+        assert view.canonical_hash() == cases[2].canonical_hash()
+        assert view.data() == cases[2].data()
+        assert view.to_record() == cases[2].to_record()
+        plan = view.get_plan()
+        assert plan.route() == cases[2].get_plan().route()
+        assert plan.costs == cases[2].get_plan().costs
+        assert view.get_plan() is plan
+        assert view.environment == cases[2].environment
+
+        # Workers attach by name and see the same cases without copying.
+        ctx = multiprocessing.get_context("spawn")
+        queue = ctx.Queue()
+        worker = ctx.Process(target=_hash_stored_case, args=(store.name, 3, queue))
+        worker.start()
+        assert queue.get(timeout=30) == cases[3].canonical_hash()
+        worker.join()
+
+
+def test_case_view_runs_case_methods():
+    from store import CaseStore
+
+    case = Case(seed=3, verbose=False)
+    with CaseStore.create([case]) as store:
+        view = store[0]
+        assert view.suspects[0] is view.suspects[0]
+        assert view[1] == store[0][1]
+        for criterion in (case[0].gender, case[0].link):
+            assert view.filter(criterion)[0] in view.suspect2id
+        view.get_graph()
+        view.get_commonalities()
+        assert view.get_dopplegangers() == case.dopplegangers
+        assert view.data() == case.data()
+    # Views may outlive their store, which still unlinks its block.
+    with pytest.raises(ValueError):
+        store[0].n_suspects
+    with pytest.raises(FileNotFoundError):
+        CaseStore.attach(store.name)
+
+
+def test_case_store_rejects_oversized_cases():
+    from store import MAX_SUSPECTS, CaseStore
+    from suspect import Suspect
+
+    case = Case(seed=3, verbose=False)
+    case.suspects += [Suspect() for _ in range(MAX_SUSPECTS + 1 - case.n_suspects)]
+    case.n_suspects = len(case.suspects)
+    case.environment["can_inspect_houses"] += [False] * (MAX_SUSPECTS + 1)
+    with pytest.raises(ValueError):
+        CaseStore.create([case])
+
+
+def test_compound_query_matches_brute_force():
+    import random
+    import timeit
+
+    from query import Population, Q
+    from suspect import Suspect
+
+    random.seed(0)
+    suspects = [Suspect() for _ in range(3000)]
+    population = Population(suspects)
+    query = (
+        Q(Gender.MALE) & Q(Height.TALL)
+        & (Q(BloodType.A) | Q(BloodType.AB)) & ~Q(LinkToVictim.SIBLING)
+    )
+    expected = [
+        s for s in suspects
+        if s.gender == Gender.MALE and s.height == Height.TALL
+        and s.blood_type in (BloodType.A, BloodType.AB)
+        and s.link != LinkToVictim.SIBLING
+    ]
+    assert population.select(query) == expected
+    assert population.count(query) == len(expected)
+    assert population.select(Hand.LEFT) == [s for s in suspects if s.hand == Hand.LEFT]
+    reflected = (
+        Gender.MALE & Q(Height.TALL)
+        & (BloodType.A | Q(BloodType.AB)) & ~Q(LinkToVictim.SIBLING)
+    )
+    assert reflected == query
+    assert population.select(reflected) == expected
+    # Queries built separately share cache entries.
+    assert (Q(BloodType.AB) | Q(BloodType.A)) in population.cache
+    assert timeit.timeit(lambda: population.count(query), number=1000) < 0.1
+
+    case = Case(seed=0, verbose=False)
+    assert case.query(Q(case[0].gender) & Q(case[0].hand))[0] is case[0]
+    # The index follows changes to the suspects.
+    case.suspects.reverse()
+    assert case.query(Q(case[-1].gender) & Q(case[-1].hand))[-1] is case[-1]
+
+
+def test_query_cache_evicts_least_recently_used(monkeypatch):
+    import query
+    from query import Population, Q
+    from suspect import Suspect
+
+    monkeypatch.setattr(query, "CACHE_SIZE", 2)
+    population = Population([Suspect() for _ in range(50)])
+    hot = Q(Gender.MALE) & Q(Hand.LEFT)
+    cold = [Q(Gender.MALE) & Q(height) for height in Height]
+    population.count(hot)
+    for q in cold:
+        population.count(q)
+        population.count(hot)
+    assert list(population.cache) == [cold[-1], hot]
+
+
+def test_investigation_plan_isolates_murderer():
+    from planner import ALIBI, InvestigationPlan
+
+    for seed in range(5):
+        case = Case(seed=seed, verbose=False)
+        plan = case.get_plan()
+        route = plan.route()
+        assert len(route) == plan.remaining_visits()
+        assert plan.next_action(route) is None
+
+        def matching(suspects, action=None):
+            for fact, clue in case.clues.items():
+                if clue is AlibiClue or action not in (None, clue.location):
+                    continue
+                attr = trait_map[clue.clue_type]
+                suspects = [i for i in suspects if getattr(case[i], attr) == fact]
+            return suspects
+
+        # Innocents sharing every revealed fact have an alibi.
+        alibis = set(matching(range(1, case.n_suspects)))
+        suspects = list(range(case.n_suspects))
+        for action in route:
+            if action == ALIBI:
+                suspects = [i for i in suspects if i not in alibis]
+            else:
+                suspects = matching(suspects, action)
+        assert suspects == [0]
+
+        restored = InvestigationPlan.from_dict(case.to_record()["plan"])
+        assert restored.route() == route
+        assert restored.costs == plan.costs
+        assert case.to_record()["reveals"] == len(route)
+        if route:
+            assert restored.route(route[:1]) == route[1:]